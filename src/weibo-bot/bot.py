@@ -1,30 +1,36 @@
 import argparse
-import copy
+import ast
 import datetime
 import functools
+import hashlib
 import importlib
 import json
 import logging
+import math
+import operator
 import os
+import pickle
 import random
 import re
 import signal
+import stat
+import string
 import sys
-import tomllib
 import urllib.parse
 import urllib.request
-from _thread import LockType
-from collections.abc import Callable
-from http.cookies import SimpleCookie
+import warnings
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from logging import config
-from threading import Event, Lock
+from threading import Event, Lock, RLock
+from types import CodeType, MappingProxyType
 from typing import Any
 
-import qrcode
-import qrcode.constants
 from apscheduler import events
+from apscheduler.executors.pool import ThreadPoolExecutor as PoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.schedulers.base import STATE_STOPPED, BaseScheduler
 from apscheduler.triggers.cron import CronTrigger
 from RestrictedPython import compile_restricted, safe_builtins
 from RestrictedPython.Eval import (default_guarded_getitem,
@@ -34,11 +40,15 @@ from selenium import webdriver
 from selenium.common import exceptions as EX
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 __all__ = ["Bot"]
 
@@ -49,56 +59,277 @@ _EVENT_PROCESS = "Process"
 _EVENT_EXECUTION = "Execution"
 _EVENT_NOTIFICATION = "Notification"
 
+_LOG_FORMAT = "%-16s - %-12s | %s"
+
+
+_IDENT_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+_RE_DIGITS = re.compile(r"[0-9]+")
+_RE_ALNUM = re.compile(r"[A-Za-z0-9]+")
+_RE_SIMPLE_FIELD = re.compile(r"""\A(?:envs|mods|vars)(?:\[(?:'[^'\[\]{}:!]+'|"[^"\[\]{}:!]+"|[0-9]+)\])*\Z""")
+_RE_FIELD_KEY = re.compile(r"""\[(?:'([^']+)'|"([^"]+)")\]""")
+
+
+_COUNT_XPATH_JS = "return document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength"
+_FILL_TEXTAREA_JS = "const [e, v, a] = arguments; Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set.call(e, a ? e.value + v : v); e.dispatchEvent(new Event('input', { bubbles: true }));"
+
+
+_CHROME_USER_DATA_DIR = os.path.expanduser("~/.config/google-chrome")
+
+
+_COOKIE_BASE: dict[str, Any] = {
+    "domain": ".weibo.com",
+    # "expiry": null,
+    "path": "/",
+    "httpOnly": False,
+    "hostOnly": False,
+    "secure": False
+}
+
+_CDP_COOKIE_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+
 
 _logger = logging.getLogger(__name__)
+_console_lock = Lock()
+
+
+def _locked(lock, func):
 
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        lock.acquire()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            lock.release()
+
+    return wrapper
 
 def sync(lock):
-    if isinstance(lock, LockType):
+    if callable(lock):
+        return _locked(Lock(), lock)
+    else:
+        return functools.partial(_locked, lock)
 
-        def decorator(func):
+def _synchronized(func):
 
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                with lock:
-                    return func(*args, **kwargs)
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        lock = self._Poster__lock
+        lock.acquire()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            lock.release()
 
-            return wrapper
+    return wrapper
 
-        return decorator
+def _guarded_import(name: str, globals = None, locals = None, fromlist = (), level: int = 0) -> Any:
+    # Restricted code cannot name __import__, but C code such as datetime.__format__ imports through it.
+    if level != 0 or name not in _SAFE_IMPORTS:
+        raise ImportError(f"Import of {repr(name)} is not allowed; expected one of {sorted(_SAFE_IMPORTS)}")
 
-    else:
-        func = lock
-        lock = Lock()
+    return importlib.import_module(name)
+
+
+_SAFE_IMPORTS = frozenset({ "time" })
+_SAFE_BUILTINS: dict[str, Any] = {
+    **safe_builtins,
+
+    "__import__": _guarded_import,
+
+    "_getitem_": default_guarded_getitem,
+    "_getiter_": default_guarded_getiter,
+    "_iter_unpack_sequence_": guarded_iter_unpack_sequence
+}
+
+_FOLDABLE_NODES = (
+    ast.Expression, ast.Constant, ast.Tuple, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Load, ast.operator, ast.unaryop, ast.boolop, ast.cmpop
+)
+
+
+@functools.lru_cache(maxsize = 1024)
+def _compile_restricted_eval(expr: str) -> CodeType:
+    return compile_restricted(expr, mode = "eval")
+
+@functools.lru_cache(maxsize = 1024)
+def _compile_restricted_fstring(fstring: str) -> CodeType:
+    return compile_restricted(f'f{repr(fstring)}', mode = "eval")
+
+def _convert_simple_field(field: str) -> str | None:
+    if not _RE_SIMPLE_FIELD.match(field):
+        return None
+
+    keys = [match[1] or match[2] for match in _RE_FIELD_KEY.finditer(field)]
+
+    # str.format reads an all-digit key as an integer index.
+    if any(key.isdigit() for key in keys):
+        return None
+
+    return _RE_FIELD_KEY.sub(lambda match: f"[{match[1] or match[2]}]", field)
+
+@functools.lru_cache(maxsize = 1024)
+def _compile_fstring(fstring: str) -> str | CodeType:
+    try:
+        parts = list(string.Formatter().parse(fstring))
+    except ValueError:
+        return _compile_restricted_fstring(fstring)
 
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            with lock:
-                return func(*args, **kwargs)
+    template: list[str] = []
 
-        return wrapper
+    for literal, field, spec, conversion in parts:
+        template.append(literal.replace("{", "{{").replace("}", "}}"))
 
+        if field is None:
+            continue
+
+        if (converted_field := _convert_simple_field(field)) is None or "{" in spec or "}" in spec:
+            return _compile_restricted_fstring(fstring)
+
+        template.append(f"{{{converted_field}{f'!{conversion}' if conversion else ''}{f':{spec}' if spec else ''}}}")
+
+    return "".join(template)
+
+def _bind_fstring(compiled: str | CodeType) -> Callable[[dict[str, Any]], str]:
+    return compiled.format_map if isinstance(compiled, str) else functools.partial(_safe_eval_code, compiled)
+
+def _render_images(renders: tuple[Callable[[dict[str, Any]], str], ...], kwargs: dict[str, Any]) -> list[str]:
+    return [render(kwargs) for render in renders]
+
+def _eval_images(code: CodeType, kwargs: dict[str, Any]) -> list[str]:
+    return [*(evaluated if (evaluated := _safe_eval_code(code, kwargs)) is not None else [])]
+
+def _const_options(options: dict[str, Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+    return options
+
+def _eval_options(code: CodeType, kwargs: dict[str, Any]) -> dict[str, Any]:
+    return { **(evaluated if (evaluated := _safe_eval_code(code, kwargs)) is not None else {}) }
+
+def _safe_eval_code(code: CodeType, globals: dict[str, Any] | None = None, locals: dict[str, Any] | None = None) -> Any:
+    # A fresh globals dict per call, since assignment expressions write into it.
+    return eval(code, { "__builtins__": _SAFE_BUILTINS } if globals is None else { "__builtins__": _SAFE_BUILTINS, **globals }, locals)
 
 def _safe_eval(expr: str, globals: dict[str, Any] | None = None, locals: dict[str, Any] | None = None) -> Any:
-    code = compile_restricted(expr, mode = "eval")
+    return _safe_eval_code(_compile_restricted_eval(expr), globals, locals)
 
-    return eval(code, {
-        "__builtins__": {
-            **safe_builtins,
+@functools.lru_cache(maxsize = 32)
+def _parse_cookie_header(value: str) -> tuple[dict[str, Any], ...]:
+    cookies: dict[str, dict[str, Any]] = {}
 
-            "_getitem_": default_guarded_getitem,
-            "_getiter_": default_guarded_getiter,
-            "_iter_unpack_sequence_": guarded_iter_unpack_sequence
-        },
+    for part in value.split(";"):
+        key, sep, item = part.partition("=")
+
+        if sep and (key := key.strip()):
+            cookie = _COOKIE_BASE.copy()
+            cookie["name"] = key
+            cookie["value"] = item.strip()
+            cookies[key] = cookie
+
+    return tuple(cookies.values())
+
+@functools.lru_cache(maxsize = 32)
+def _parse_cookie_json(value: str) -> tuple[dict[str, Any], ...]:
+    cookies = tuple(cookie for cookie in _json_loads(value) if isinstance(cookie, dict))
+
+    for cookie in cookies:
+        if isinstance(cookie.get("expiry"), float):
+            cookie["expiry"] = int(cookie["expiry"])
+
+    return cookies
+
+def _to_cdp_cookie(cookie: dict[str, Any]) -> dict[str, Any]:
+    cdp_cookie = {key: cookie[key] for key in _CDP_COOKIE_KEYS if key in cookie}
+
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    if "domain" not in cdp_cookie:
+        cdp_cookie["url"] = "https://weibo.com"
+
+    return cdp_cookie
+
+def _json_loads(value: str | bytes) -> Any:
+    return orjson.loads(value) if orjson is not None else json.loads(value)
+
+def _json_dumps(value: Any) -> bytes:
+    return orjson.dumps(value) if orjson is not None else json.dumps(value, ensure_ascii = False).encode()
+
+def _is_json_native(value: Any) -> bool:
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_native(item) for key, item in value.items())
+    elif isinstance(value, list):
+        return all(_is_json_native(item) for item in value)
+    elif isinstance(value, float):
+        return math.isfinite(value)
+    else:
+        return value is None or isinstance(value, str | bool | int)
+
+def _load_conf(path: str) -> dict[str, Any]:
+    cache_path = f"{path}.cache.json"
+
+    with open(path, "rb") as f:
+        raw = f.read()
+        mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+
+    key = hashlib.blake2b(raw, digest_size = 16).hexdigest()
+
+    try:
+        with open(cache_path, "rb") as f:
+            cache = _json_loads(f.read())
+
+        if cache["key"] == key:
+            return cache["conf"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    try:
+        import tomli as tomllib
+    except ImportError:
+        import tomllib
+
+    conf = tomllib.loads(raw.decode())
+
+    # TOML dates and times have no JSON form, so such configs are never cached.
+    if _is_json_native(conf):
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+        try:
+            # The cache holds the cookies too, so it gets the same permissions as the config.
+            with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode), "wb") as f:
+                os.fchmod(f.fileno(), mode)
+                f.write(_json_dumps({ "key": key, "conf": conf }))
+
+            os.replace(temp_path, cache_path)
+        except OSError:
+            _try_delete_file(temp_path)
+
+    return conf
+
+@functools.lru_cache(maxsize = 256)
+def _import_module(name: str) -> Any:
+    return importlib.import_module(name)
+
+def _is_immutable(value: Any) -> bool:
+    if isinstance(value, tuple | frozenset):
+        return all(_is_immutable(item) for item in value)
+    else:
+        return value is None or isinstance(value, str | bytes | bool | int | float | complex)
+
+def _is_foldable(node: ast.AST, folded: Mapping[str, Any]) -> bool:
+    if isinstance(node, ast.Subscript):
+        return isinstance(node.value, ast.Name) and node.value.id == "vars" and isinstance(node.slice, ast.Constant) and node.slice.value in folded
+    elif isinstance(node, _FOLDABLE_NODES):
+        return all(_is_foldable(child, folded) for child in ast.iter_child_nodes(node))
+    else:
+        return False
 
-        **(globals if globals is not None else {})
-    }, locals)
+def _clone(value: Any) -> Any:
+    return pickle.loads(pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL))
 
-def _format_fstring(fstring: str, **kwargs) -> str:
-    return _safe_eval(f'f{repr(fstring)}', kwargs)
+@functools.lru_cache(maxsize = 512)
+def _format_sender(sender, root: bool = False) -> str:
+    return f"<{sender}>" if root else f"[{sender}]"
 
-def _format_message(sender, event, message, root: bool = False) -> str:
-    return f"{f'<{sender}>' if root else f'[{sender}]':<16} - {event:<12} | {message}"
+_SYSTEM_FORMAT: str = _LOG_FORMAT % (_format_sender(_SYSTEM, True), _EVENT_EXECUTION, "%s")
 
 def _try_delete_file(path: str) -> bool:
     try:
@@ -108,165 +339,216 @@ def _try_delete_file(path: str) -> bool:
     except OSError:
         return False
 
+def _retrieve_files(paths: list[str]) -> list[tuple[str, bool]]:
+    with ThreadPoolExecutor(max_workers = min(8, len(paths))) as executor:
+        downloads = [executor.submit(urllib.request.urlretrieve, path) if not os.path.isfile(path) else None for path in paths]
 
-class FullCronTrigger(CronTrigger):
+    try:
+        return [(os.path.abspath(path), False) if download is None else (download.result()[0], True) for path, download in zip(paths, downloads)]
+    except:
+        for download in downloads:
+            if download is not None and download.exception() is None:
+                _try_delete_file(download.result()[0])
 
-    @classmethod
-    def from_cron(cls, expr, timezone = None, jitter = None):
-        values = expr.split()
+        raise
 
-        match len(values):
-            case 5:
-                return cls(minute = values[0], hour = values[1], day = values[2], month = values[3],
-                           day_of_week = values[4], timezone = timezone, jitter = jitter)
-            case 6:
-                return cls(second = values[0], minute = values[1], hour = values[2], day = values[3],
-                           month = values[4], day_of_week = values[5], timezone = timezone, jitter = jitter)
-            case 7:
-                return cls(second = values[0], minute = values[1], hour = values[2], day = values[3],
-                           month = values[4], day_of_week = values[5], year = values[6], timezone = timezone, jitter = jitter)
-            case _:
-                raise ValueError(f"Wrong number of fields; got {len(values)}, expected 5 or 6 or 7")
+def _format_time(value: datetime.datetime) -> str:
+    return value.replace(tzinfo = None).isoformat(" ", "seconds")
 
+def _format_next_run(next_run_time: datetime.datetime) -> str:
+    return f"The next job is scheduled for '{_format_time(next_run_time)}'"
 
-class PreviewException(Exception):
-    pass
+def _build_payload(text: str, images: list[str], options: dict) -> str | dict[str, Any]:
+    if not images and not options:
+        return text
 
+    payload = { "text": text }
 
-class Validator:
-    __id: str
+    if images:
+        payload["images"] = images
+    if options:
+        payload["options"] = options
 
-    def __init__(self, id: str) -> None:
-        self.__id = id
+    return payload
 
-    @property
-    def id(self) -> str:
-        return self.__id
+def _format_process(template_conf, text: str, images: list[str], options: dict) -> str:
+    return f"{repr(template_conf)} -> {repr(_build_payload(text, images, options))}"
 
-    def validate(self, value) -> Any:
-        pass
+def _log_next_run(scheduler: BaseScheduler, job_id: str) -> None:
+    if not _logger.isEnabledFor(logging.INFO):
+        return
 
+    job = scheduler.get_job(job_id)
 
-class UserNameValidator(Validator):
+    if job is None or job.next_run_time is None:
+        return
 
-    def __init__(self, id: str) -> None:
-        super().__init__(id)
+    _logger.info(_LOG_FORMAT, _format_sender(job_id), _EVENT_NOTIFICATION, _Lazy(_format_next_run, job.next_run_time))
 
-    def validate(self, value) -> str:
-        if re.search(r"^[A-Za-z0-9_-]+$", value):
-            return value
-        else:
-            raise ValueError(f"Wrong value of user name @{self.id}; got {repr(value)}, expected ^[A-Za-z0-9_-]+$")
+def _on_job_executed(scheduler: BaseScheduler, event: events.JobExecutionEvent) -> None:
+    if _logger.isEnabledFor(logging.INFO):
+        _logger.info(_LOG_FORMAT, _format_sender(event.job_id), _EVENT_EXECUTION, "Success!" if event.retval else "Preview over!")
+    _log_next_run(scheduler, event.job_id)
 
+def _on_job_missed(scheduler: BaseScheduler, event: events.JobExecutionEvent) -> None:
+    _logger.warning(_LOG_FORMAT, _format_sender(event.job_id), _EVENT_EXECUTION, _Lazy(
+        lambda: f"The job scheduled for '{_format_time(event.scheduled_run_time)}' has missed!"
+    ))
+    _log_next_run(scheduler, event.job_id)
 
-class CookieValidator(Validator):
+def _on_job_max_instances(scheduler: BaseScheduler, event: events.JobSubmissionEvent) -> None:
+    _logger.warning(_LOG_FORMAT, _format_sender(event.job_id), _EVENT_EXECUTION, _Lazy(
+        lambda: f"The job scheduled for {[_format_time(scheduled_run_time) for scheduled_run_time in event.scheduled_run_times]} has skipped!"
+    ))
+    _log_next_run(scheduler, event.job_id)
 
-    def __init__(self, id: str) -> None:
-        super().__init__(id)
-
-    def validate(self, value) -> dict[str, Any]:
-        if isinstance(value, str):
-            return {
-                "source": "string",
-                "type": "header",
-                "value": value
-            }
-        elif isinstance(value, dict):
-            return {
-                "source": value.get("source"),
-                "type": value["type"],
-                "value": value["value"]
-            }
-        else:
-            raise TypeError(f"Wrong type of cookies @{self.id}; got '{type(value).__name__}', expected '{str.__name__}' or '{dict.__name__}[{str.__name__}, Any]'")
+def _on_job_error(scheduler: BaseScheduler, event: events.JobExecutionEvent) -> None:
+    _logger.error(_LOG_FORMAT, _format_sender(event.job_id), _EVENT_EXECUTION, _Lazy(
+        lambda: f"Oops, an error occurred! -> {repr(event.exception)}"
+    ))
+    _log_next_run(scheduler, event.job_id)
 
 
-class ModValidator(Validator):
+_JOB_EVENT_HANDLERS: dict[int, Callable[[BaseScheduler, events.JobEvent], None]] = {
+    events.EVENT_JOB_EXECUTED: _on_job_executed,
+    events.EVENT_JOB_MISSED: _on_job_missed,
+    events.EVENT_JOB_MAX_INSTANCES: _on_job_max_instances,
+    events.EVENT_JOB_ERROR: _on_job_error
+}
+_JOB_EVENT_MASK = functools.reduce(operator.or_, _JOB_EVENT_HANDLERS)
 
-    def __init__(self, id: str) -> None:
-        super().__init__(id)
+def _on_job_event(scheduler: BaseScheduler, event: events.JobEvent) -> None:
+    _JOB_EVENT_HANDLERS[event.code](scheduler, event)
 
-    def validate(self, value) -> dict[str, Any]:
-        if isinstance(value, str):
-            return {
-                "type": "module",
-                "value": value
-            }
-        elif isinstance(value, dict):
-            return {
-                "type": value["type"],
-                "value": value["value"]
-            }
-        else:
-            raise TypeError(f"Wrong type of mod @{self.id}; got '{type(value).__name__}', expected '{str.__name__}' or '{dict.__name__}[{str.__name__}, Any]'")
 
+class _Lazy:
 
-class JobNameValidator(Validator):
+    __slots__ = ("__func", "__args", "__kwargs")
 
-    def __init__(self, id: str) -> None:
-        super().__init__(id)
+    def __init__(self, func: Callable[..., str], *args, **kwargs):
+        self.__func = func
+        self.__args = args
+        self.__kwargs = kwargs
 
-    def validate(self, value) -> str:
-        if re.search(r"^[A-Za-z0-9_-]+$", value):
-            return value
-        else:
-            raise ValueError(f"Wrong value of job name @{self.id}; got {repr(value)}, expected ^[A-Za-z0-9_-]+$")
+    def __str__(self) -> str:
+        return self.__func(*self.__args, **self.__kwargs)
 
 
-class CommandValidator(Validator):
+class FullCronTrigger(CronTrigger):
 
-    def __init__(self, id: str) -> None:
-        super().__init__(id)
+    @classmethod
+    def from_cron(cls, expr, timezone = None, jitter = None):
+        values = expr.split()
 
-    def validate(self, value) -> list[str] | None:
-        (commands, group) = value
+        match len(values):
+            case 5:
+                return cls(minute = values[0], hour = values[1], day = values[2], month = values[3],
+                           day_of_week = values[4], timezone = timezone, jitter = jitter)
+            case 6:
+                return cls(second = values[0], minute = values[1], hour = values[2], day = values[3],
+                           month = values[4], day_of_week = values[5], timezone = timezone, jitter = jitter)
+            case 7:
+                return cls(second = values[0], minute = values[1], hour = values[2], day = values[3],
+                           month = values[4], day_of_week = values[5], year = values[6], timezone = timezone, jitter = jitter)
+            case _:
+                raise ValueError(f"Wrong number of fields; got {len(values)}, expected 5 or 6 or 7")
 
-        if commands is None:
-            return None
 
-        if (group_commands := commands.get(group)) is None:
-            return None
+class PreviewException(Exception):
+    # Deprecated: Poster.send returns False in preview mode instead of raising this.
 
-        if isinstance(group_commands, str):
-            return [group_commands]
-        elif isinstance(group_commands, list):
-            return group_commands
-        else:
-            raise TypeError(f"Wrong type of {group} commands @{self.id}; got '{type(group_commands).__name__}', expected '{str.__name__}' or '{list.__name__}[{str.__name__}]'")
+    def __init__(self, *args) -> None:
+        warnings.warn("PreviewException is deprecated; Poster.send returns False in preview mode", DeprecationWarning, stacklevel = 2)
+        super().__init__(*args)
 
 
-class TemplateValidator(Validator):
+@functools.lru_cache(maxsize = 256)
+def _build_cron_trigger(expr: str, timezone: str | None = None, jitter: int | None = None) -> FullCronTrigger:
+    return FullCronTrigger.from_cron(expr, timezone, jitter)
 
-    def __init__(self, id: str) -> None:
-        super().__init__(id)
-
-    def validate(self, value) -> dict[str, Any]:
-        if isinstance(value, str):
-            return {
-                "text": value,
-                "images": [],
-                "options": {}
-            }
-        elif isinstance(value, dict):
-            return {
-                "text": value["text"],
-                "images": value.get("images", []),
-                "options": value.get("options", {})
-            }
-        else:
-            raise TypeError(f"Wrong type of template @{self.id}; got '{type(value).__name__}', expected '{str.__name__}' or '{dict.__name__}[{str.__name__}, Any]'")
+def _validate_user_name(id: str, value) -> str:
+    if value and _IDENT_CHARS.issuperset(value):
+        return value
+    else:
+        raise ValueError(f"Wrong value of user name @{id}; got {repr(value)}, expected ^[A-Za-z0-9_-]+$")
+
+def _validate_cookies(id: str, value) -> dict[str, Any]:
+    if isinstance(value, str):
+        return {
+            "source": "string",
+            "type": "header",
+            "value": value
+        }
+    elif isinstance(value, dict):
+        return {
+            "source": value.get("source"),
+            "type": value["type"],
+            "value": value["value"]
+        }
+    else:
+        raise TypeError(f"Wrong type of cookies @{id}; got '{type(value).__name__}', expected '{str.__name__}' or '{dict.__name__}[{str.__name__}, Any]'")
+
+def _validate_mod(id: str, value) -> dict[str, Any]:
+    if isinstance(value, str):
+        return {
+            "type": "module",
+            "value": value
+        }
+    elif isinstance(value, dict):
+        return {
+            "type": value["type"],
+            "value": value["value"]
+        }
+    else:
+        raise TypeError(f"Wrong type of mod @{id}; got '{type(value).__name__}', expected '{str.__name__}' or '{dict.__name__}[{str.__name__}, Any]'")
+
+def _validate_job_name(id: str, value) -> str:
+    if value and _IDENT_CHARS.issuperset(value):
+        return value
+    else:
+        raise ValueError(f"Wrong value of job name @{id}; got {repr(value)}, expected ^[A-Za-z0-9_-]+$")
+
+def _validate_commands(id: str, commands: dict[str, Any] | None, group: str) -> list[str] | None:
+    if commands is None:
+        return None
+
+    if (group_commands := commands.get(group)) is None:
+        return None
+
+    if isinstance(group_commands, str):
+        return [group_commands]
+    elif isinstance(group_commands, list):
+        return group_commands
+    else:
+        raise TypeError(f"Wrong type of {group} commands @{id}; got '{type(group_commands).__name__}', expected '{str.__name__}' or '{list.__name__}[{str.__name__}]'")
+
+def _validate_template(id: str, value) -> dict[str, Any]:
+    if isinstance(value, str):
+        return {
+            "text": value,
+            "images": [],
+            "options": {}
+        }
+    elif isinstance(value, dict):
+        return {
+            "text": value["text"],
+            "images": value.get("images", []),
+            "options": value.get("options", {})
+        }
+    else:
+        raise TypeError(f"Wrong type of template @{id}; got '{type(value).__name__}', expected '{str.__name__}' or '{dict.__name__}[{str.__name__}, Any]'")
 
 
 class CookieProvider:
-    __value: list[dict[str, Any]] | None
+    __value: tuple[dict[str, Any], ...] | None
     __options: dict[str, Any] | None
 
-    def __init__(self, value: list[dict[str, Any]] | None, options: dict[str, Any] | None = None) -> None:
+    def __init__(self, value: tuple[dict[str, Any], ...] | None, options: dict[str, Any] | None = None) -> None:
         self.__value = value
         self.__options = options
 
     @property
-    def value(self) -> list[dict[str, Any]] | None:
+    def value(self) -> tuple[dict[str, Any], ...] | None:
         return self.__value
 
     @property
@@ -300,33 +582,19 @@ class CookieParser:
             case _:
                 raise ValueError(f"Wrong value of cookies source @{self.id}; got {repr(source)}, expected 'string' or 'file'")
 
-        cookies: list[dict[str, Any]] | None
+        cookies: tuple[dict[str, Any], ...] | None
         options: dict[str, Any] | None
 
         match type:
             case None | "header":
-                cookies, options = [{
-                    "domain": ".weibo.com",
-                    "name": key,
-                    "value": morsel.value,
-                    # "expiry": null,
-                    "path": "/",
-                    "httpOnly": False,
-                    "hostOnly": False,
-                    "secure": False
-                } for key, morsel in SimpleCookie(actual_value).items()], None
+                cookies, options = _parse_cookie_header(actual_value), None
             case "json":
-                cookies, options = [cookie for cookie in json.loads(actual_value) if isinstance(cookie, dict)], None
+                cookies, options = _parse_cookie_json(actual_value), None
             case "live":
-                cookies, options = None, json.loads(actual_value)
+                cookies, options = None, _json_loads(actual_value)
             case _:
                 raise ValueError(f"Wrong value of cookies type @{self.id}; got {repr(type)}, expected 'header' or 'json'")
 
-        if cookies is not None:
-            for cookie in cookies:
-                if isinstance(cookie.get("expiry"), float):
-                    cookie["expiry"] = int(cookie["expiry"])
-
         return CookieProvider(cookies, options)
 
 
@@ -348,7 +616,7 @@ class ModImporter:
 
         match type:
             case None | "module":
-                mod = importlib.import_module(value)
+                mod = _import_module(value)
             case "expression":
                 mod = _safe_eval(value, context)
             case _:
@@ -370,7 +638,7 @@ class ModImporter:
 
             match type:
                 case None | "module":
-                    mod = importlib.import_module(value)
+                    mod = _import_module(value)
                 case "expression":
                     mod = _safe_eval(value, context)
                 case _:
@@ -406,36 +674,152 @@ class TemplateSelector:
         return template
 
 
+@dataclass(frozen = True, slots = True)
+class _CompiledTemplate:
+    conf: Any
+    text: Callable[[dict[str, Any]], str]
+    images: Callable[[dict[str, Any]], list[str]]
+    options: Callable[[dict[str, Any]], dict[str, Any]]
+
+
+@dataclass(frozen = True, slots = True)
+class _CompiledJob:
+    id: str
+    envs: dict[str, Any]
+    mods: dict[str, Any]
+    vars: tuple[tuple[str, CodeType | None, Any], ...]
+    selector: TemplateSelector
+    select: str | None
+    commands: Mapping[str, tuple[CodeType, ...]]
+    templates: tuple[_CompiledTemplate, ...]
+
+
+class JobCompiler:
+    __id: str
+
+    def __init__(self, id: str) -> None:
+        self.__id = id
+
+    @property
+    def id(self) -> str:
+        return self.__id
+
+    def compile(self, envs: dict[str, Any], mods: dict[str, Any], vars: dict[str, str], select: str | None,
+                commands: dict[str, Any] | None, templates: list[dict[str, Any] | str] | None) -> _CompiledJob:
+        folded_vars: dict[str, Any] = {}
+        compiled_vars: list[tuple[str, CodeType | None, Any]] = []
+
+        for var_name, var_expr in vars.items():
+            compiled_var = self.__compile_var(var_name, var_expr, folded_vars)
+
+            if compiled_var[1] is None:
+                folded_vars[var_name] = compiled_var[2]
+
+            compiled_vars.append(compiled_var)
+
+        compiled_commands = MappingProxyType({group: compiled_group for group in ("pre", "success", "fail", "post")
+                                              if (compiled_group := tuple(_compile_restricted_eval(command) for command in (_validate_commands(self.id, commands, group) or [])))})
+        compiled_templates: list[_CompiledTemplate] = []
+
+        for template_conf in (templates if templates is not None else []):
+            template = _validate_template(self.id, template_conf)
+            template_text = template["text"]
+            template_images = template["images"]
+            template_options = template["options"]
+
+            compiled_templates.append(_CompiledTemplate(
+                conf = template_conf,
+                text = _bind_fstring(_compile_fstring(template_text)),
+                images = functools.partial(_render_images, tuple(_bind_fstring(_compile_fstring(template_image)) for template_image in template_images))
+                         if isinstance(template_images, list) else functools.partial(_eval_images, _compile_restricted_eval(template_images)),
+                options = functools.partial(_const_options, template_options)
+                          if isinstance(template_options, dict) else functools.partial(_eval_options, _compile_restricted_eval(template_options))
+            ))
+
+        return _CompiledJob(
+            id = self.id,
+            envs = envs,
+            mods = mods,
+            vars = tuple(compiled_vars),
+            selector = TemplateSelector(self.id),
+            select = select,
+            commands = compiled_commands,
+            templates = tuple(compiled_templates)
+        )
+
+    def __compile_var(self, name: str, expr: str, folded: Mapping[str, Any]) -> tuple[str, CodeType | None, Any]:
+        code = _compile_restricted_eval(expr)
+
+        # Fold constant expressions at init; mutable results such as "{}" and failures stay per fire.
+        if _is_foldable(ast.parse(expr, mode = "eval"), folded):
+            try:
+                value = _safe_eval_code(code, { "vars": folded })
+            except Exception:
+                pass
+            else:
+                if _is_immutable(value):
+                    return (name, None, value)
+
+        return (name, code, None)
+
+
 class Poster:
+    _HOME_WRAP_DIV = (By.CSS_SELECTOR, "div#homeWrap")
+    _QRCODE_IMG = (By.CSS_SELECTOR, "div#app > div > div > div:nth-of-type(2) > div:nth-of-type(1) > div:nth-of-type(2) > div > img")
+
+    _ORIGIN_TEXT_TEXTAREA = (By.CSS_SELECTOR, "div#homeWrap > div:nth-of-type(1) > div > div:nth-of-type(1) > div > textarea")
+    _ORIGIN_SEND_BUTTON = (By.CSS_SELECTOR, "div#homeWrap > div:nth-of-type(1) > div > div:nth-of-type(4) > div > div:nth-of-type(5) > button")
+    _ORIGIN_FILE_INPUT = (By.CSS_SELECTOR, "div#homeWrap > div:nth-of-type(1) > div > div:nth-of-type(2) > div > div > div:nth-of-type(1) > div > div > input")
+    _ORIGIN_ITEM_DIV_XPATH = '//div[@id="homeWrap"]/div[1]/div/div[2]/div/div/div'
+
+    _COMPOSER_TEXT_TEXTAREA = (By.CSS_SELECTOR, "div#composerEle > div:nth-of-type(2) > div > div:nth-of-type(1) > div > textarea")
+    _COMPOSER_SEND_BUTTON = (By.CSS_SELECTOR, "div#composerEle > div:nth-of-type(2) > div > div:nth-of-type(3) > div > button")
+    _COMPOSER_TOOL_DIV_XPATH = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div'
+    _COMPOSER_CHECKBOX_INPUT = (By.CSS_SELECTOR, "div#composerEle > div:nth-of-type(2) > div > div:nth-of-type(3) > div > div:nth-of-type(2) > label > input")
+    _COMPOSER_CHECKBOX_SPAN = (By.CSS_SELECTOR, "div#composerEle > div:nth-of-type(2) > div > div:nth-of-type(3) > div > div:nth-of-type(2) > label > span:nth-of-type(1)")
+
+    _REPOST_A = (By.CSS_SELECTOR, "div#scroller > div:nth-of-type(1) > div:nth-of-type(1) > div > div > div > div > div:nth-of-type(2) > div:nth-of-type(2) > div:nth-of-type(1) > a")
+
     __id: str
     __driver: WebDriver
     __preview: bool
 
-    __lock: Lock
+    __lock: RLock
+
+    __loading_wait: WebDriverWait
+    __element_wait: WebDriverWait
+    __execution_wait: WebDriverWait
 
     def __init__(self, id: str) -> None:
         self.__id = id
         self.__preview = False
-        self.__lock = Lock()
-
-        self.__with_cookies_sync()
-        self.__send_sync()
+        self.__lock = RLock()
 
         options = webdriver.ChromeOptions()
 
         options.add_argument("--no-sandbox")
-        options.add_argument("--headless")
+        options.add_argument("--headless=new")
         options.add_argument("--incognito")
         options.add_argument("--disable-gpu")
         options.add_argument("--disable-dev-shm-usage")
-        options.add_argument(f"--user-data-dir={os.path.expanduser('~/.config/google-chrome')}")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-features=Translate,BackForwardCache,AcceptCHFrame")
+        options.add_argument("--mute-audio")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--user-data-dir={_CHROME_USER_DATA_DIR}")
         options.add_argument(f"--profile-directory={id}")
 
         driver = webdriver.Chrome(options = options)
 
-        driver.maximize_window()
-
         self.__driver = driver
+        self.__loading_wait = WebDriverWait(driver, 30)
+        self.__element_wait = WebDriverWait(driver, 30)
+        self.__execution_wait = WebDriverWait(driver, 15, poll_frequency = 0.1)
 
     @property
     def id(self) -> str:
@@ -454,69 +838,53 @@ class Poster:
 
         return self
 
-    def __with_cookies_sync(self): self.with_cookies = sync(self.__lock)(self.with_cookies)
+    @_synchronized
     def with_cookies(self, provider: CookieProvider):
         driver = self.__driver
 
-        app_xpath = '//div[@id="app"]'
-        home_wrap_xpath = '//div[@id="homeWrap"]'
-
-        current = driver.current_window_handle
-        current_index = driver.window_handles.index(current)
-
-        driver.execute_script("window.open('https://weibo.com', '_blank')")
-        driver.switch_to.window(driver.window_handles[current_index + 1])
-
-        try:
-            loading_wait = WebDriverWait(driver, 30)
-
-            loading_wait.until(EC.presence_of_element_located((By.XPATH, app_xpath)))
+        loading_wait = self.__loading_wait
 
-            driver.delete_all_cookies()
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
 
-            if provider.live:
-                scanning_wait = WebDriverWait(driver, (provider.options if provider.options is not None else {}).get("qrcode", {}).get("expires", 300))
+        if provider.live:
+            import qrcode.constants
 
-                driver.get("https://passport.weibo.com/sso/signin?url=https%3A%2F%2Fweibo.com")
+            scanning_wait = WebDriverWait(driver, (provider.options if provider.options is not None else {}).get("qrcode", {}).get("expires", 300))
 
-                qrcode_img_xpath = '//div[@id="app"]/div/div/div[2]/div[1]/div[2]/div/img'
+            driver.get("https://passport.weibo.com/sso/signin?url=https%3A%2F%2Fweibo.com")
 
-                qrcode_img: WebElement = loading_wait.until(EC.presence_of_element_located((By.XPATH, qrcode_img_xpath))) \
-                                            if loading_wait.until(EC.text_to_be_present_in_element_attribute((By.XPATH, qrcode_img_xpath), "src", "http")) \
-                                            else None
-                qrcode_img_src: str = qrcode_img.get_attribute("src")
+            qrcode_img: WebElement = loading_wait.until(EC.presence_of_element_located(self._QRCODE_IMG)) \
+                                        if loading_wait.until(EC.text_to_be_present_in_element_attribute(self._QRCODE_IMG, "src", "http")) \
+                                        else None
+            qrcode_img_src: str = qrcode_img.get_attribute("src")
 
-                qrcode_content = urllib.parse.parse_qs(urllib.parse.urlparse(qrcode_img_src).query)["data"][0]
+            qrcode_content = urllib.parse.parse_qs(urllib.parse.urlparse(qrcode_img_src).query)["data"][0]
 
-                qr = qrcode.QRCode(
-                    version = 1,
-                    error_correction = qrcode.constants.ERROR_CORRECT_L,
-                    box_size = 10,
-                    border = 2
-                )
+            qr = qrcode.QRCode(
+                version = 1,
+                error_correction = qrcode.constants.ERROR_CORRECT_L,
+                box_size = 10,
+                border = 2
+            )
 
-                qr.add_data(qrcode_content)
+            qr.add_data(qrcode_content)
 
+            with _console_lock:
                 print(f"@{self.id}, expires at '{(datetime.datetime.now() + datetime.timedelta(seconds = scanning_wait._timeout)):%Y-%m-%d %H:%M:%S}'")
                 qr.print_ascii(invert = True)
 
-                scanning_wait.until(EC.presence_of_element_located((By.XPATH, home_wrap_xpath)))
+            scanning_wait.until(EC.presence_of_element_located(self._HOME_WRAP_DIV))
 
-            else:
-                for cookie in provider.value:
-                    driver.add_cookie(cookie)
+        else:
+            driver.execute_cdp_cmd("Network.setCookies", { "cookies": [_to_cdp_cookie(cookie) for cookie in provider.value] })
 
-                driver.refresh()
-                loading_wait.until(EC.presence_of_element_located((By.XPATH, home_wrap_xpath)))
-
-        finally:
-            driver.close()
-            driver.switch_to.window(current)
+            self.__navigate("https://weibo.com")
+            loading_wait.until(EC.presence_of_element_located(self._HOME_WRAP_DIV))
 
         return self
 
-    def __send_sync(self): self.send = sync(self.__lock)(self.send)
-    def send(self, **kwargs) -> None:
+    @_synchronized
+    def send(self, **kwargs) -> bool:
         text: str = kwargs.get("text", "")
         images: list[str] = kwargs.get("images", [])
         options: dict[str, Any] = kwargs.get("options", {})
@@ -525,15 +893,15 @@ class Poster:
 
         match behavior:
             case None | "origin":
-                self.__send_origin(text, images, options)
+                return self.__send_origin(text, images, options)
             case "repost":
-                self.__send_repost(text, images, options)
+                return self.__send_repost(text, images, options)
             case "comment":
-                self.__send_comment(text, images, options)
+                return self.__send_comment(text, images, options)
             case _:
                 raise ValueError(f"Wrong value of behavior @{self.id}; got {repr(behavior)}, expected 'origin' or 'repost' or 'comment'")
 
-    def __send_origin(self, text: str, images: list[str], options: dict[str, Any]) -> None:
+    def __send_origin(self, text: str, images: list[str], options: dict[str, Any]) -> bool:
         if not images and (not text or text.isspace()):
             raise ValueError(f"Wrong value of text @{self.id}; got {repr(text)}, expected not empty and not whitespace, if there is no images")
 
@@ -541,73 +909,58 @@ class Poster:
         preview = self.__preview
 
         if preview:
-            raise PreviewException(f"Preview over @{self.id}")
-
-        current = driver.current_window_handle
-        current_index = driver.window_handles.index(current)
+            return False
 
-        driver.execute_script("window.open('https://weibo.com', '_blank')")
-        driver.switch_to.window(driver.window_handles[current_index + 1])
-
-        try:
-            element_wait = WebDriverWait(driver, 30)
-            execution_wait = WebDriverWait(driver, 15)
+        self.__navigate("https://weibo.com")
 
-            text_textarea_xpath = '//div[@id="homeWrap"]/div[1]/div/div[1]/div/textarea'
-            send_button_xpath = '//div[@id="homeWrap"]/div[1]/div/div[4]/div/div[5]/button'
+        element_wait = self.__element_wait
+        execution_wait = self.__execution_wait
 
-            text_textarea: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, text_textarea_xpath)))
-            send_button: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, send_button_xpath)))
+        text_textarea: WebElement = element_wait.until(EC.presence_of_element_located(self._ORIGIN_TEXT_TEXTAREA))
+        send_button: WebElement = element_wait.until(EC.presence_of_element_located(self._ORIGIN_SEND_BUTTON))
 
-            # text_textarea.clear()
-            text_textarea.send_keys(Keys.CONTROL, "A")
-            text_textarea.send_keys(Keys.DELETE)
-            execution_wait.until(EC.element_attribute_to_include((By.XPATH, send_button_xpath), "disabled"))
+        self.__fill_textarea(text_textarea, "")
+        execution_wait.until(EC.element_attribute_to_include(self._ORIGIN_SEND_BUTTON, "disabled"))
 
-            if images:
-                file_input_xpath = '//div[@id="homeWrap"]/div[1]/div/div[2]/div/div/div[{index}]/div/div/input'
+        if images:
+            file_input: WebElement = element_wait.until(EC.presence_of_element_located(self._ORIGIN_FILE_INPUT))
+            file_input_accept: str = file_input.get_attribute("accept")
 
-                file_input: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, file_input_xpath.format(index = 1))))
-                file_input_accept: str = file_input.get_attribute("accept")
+            files: list[tuple[str, bool]] = []
 
-                files: list[tuple[str, bool]] = []
-
-                try:
-                    for image in images:
-                        files.append((os.path.abspath(image), False) if os.path.isfile(image) else (urllib.request.urlretrieve(image)[0], True))
+            try:
+                files.extend(_retrieve_files(images))
 
-                    file_input.send_keys("\n".join((file[0] for file in files)))
-                    execution_wait.until(EC.element_to_be_clickable((By.XPATH, send_button_xpath)))
+                file_input.send_keys("\n".join([file[0] for file in files]))
+                execution_wait.until(EC.element_to_be_clickable(send_button))
 
-                    upload_wait = WebDriverWait(driver, 60)
+                file_div_count: int = execution_wait.until(lambda driver: driver.execute_script(_COUNT_XPATH_JS, self._ORIGIN_ITEM_DIV_XPATH)) - 1
 
-                    item_div_xpath = '//div[@id="homeWrap"]/div[1]/div/div[2]/div/div/div'
-                    cover_img_xpath = '//div[@id="homeWrap"]/div[1]/div/div[2]/div/div/div[{index}]/div/div/img'
+                if (files_diff := len(files) - file_div_count) > 0:
+                    raise ValueError(f"Find {files_diff} unacceptable image(s) @{self.id}; got {images}, expected [images]{{0,18}} or [images and videos]{{0,9}}, accepted {repr(file_input_accept)}")
 
-                    file_div_list: list[WebElement] = execution_wait.until(EC.presence_of_all_elements_located((By.XPATH, item_div_xpath)))[:-1]
+                covered_div_xpath = f"{self._ORIGIN_ITEM_DIV_XPATH}[position() <= {file_div_count}][div/div/img]"
 
-                    if (files_diff := len(files) - len(file_div_list)) > 0:
-                        raise ValueError(f"Find {files_diff} unacceptable image(s) @{self.id}; got {images}, expected [images]{{0,18}} or [images and videos]{{0,9}}, accepted {repr(file_input_accept)}")
+                # Each file gets up to 60s to upload.
+                upload_wait = WebDriverWait(driver, 60 * file_div_count)
 
-                    for index in range(len(file_div_list)):
-                        upload_wait.until(EC.presence_of_element_located((By.XPATH, cover_img_xpath.format(index = 1 + index))))
+                upload_wait.until(lambda driver: driver.execute_script(_COUNT_XPATH_JS, covered_div_xpath) == file_div_count)
 
-                finally:
-                    for path in (file[0] for file in files if file[1]):
+            finally:
+                for (path, temporary) in files:
+                    if temporary:
                         _try_delete_file(path)
 
-            text_textarea.send_keys(text)
-            execution_wait.until(EC.element_to_be_clickable((By.XPATH, send_button_xpath)))
+        self.__fill_textarea(text_textarea, text, append = True)
+        execution_wait.until(EC.element_to_be_clickable(send_button))
 
-            # send_button.click()
-            driver.execute_script("arguments[0].click();", send_button)
-            execution_wait.until(EC.element_attribute_to_include((By.XPATH, send_button_xpath), "disabled"))
+        # send_button.click()
+        driver.execute_script("arguments[0].click();", send_button)
+        execution_wait.until(EC.element_attribute_to_include(self._ORIGIN_SEND_BUTTON, "disabled"))
 
-        finally:
-            driver.close()
-            driver.switch_to.window(current)
+        return True
 
-    def __send_repost(self, text: str, images: list[str], options: dict[str, Any]) -> None:
+    def __send_repost(self, text: str, images: list[str], options: dict[str, Any]) -> bool:
 
         def text_to_be_not_equal_to_element_attribute(locator, attribute_, text_):
             """
@@ -628,75 +981,56 @@ class Poster:
 
         quote: dict[str, Any] = options.get("quote", {})
 
-        if not re.search(r"^[0-9]+$", quote["uid"]):
+        if not _RE_DIGITS.fullmatch(quote["uid"]):
             raise ValueError(f"Wrong value of quote.uid @{self.id}; got {repr(quote['uid'])}, expected ^[0-9]+$")
 
-        if not re.search(r"^[A-Za-z0-9]+$", quote["bid"]):
+        if not _RE_ALNUM.fullmatch(quote["bid"]):
             raise ValueError(f"Wrong value of quote.bid @{self.id}; got {repr(quote['bid'])}, expected ^[A-Za-z0-9]+$")
 
         driver = self.__driver
         preview = self.__preview
 
         if preview:
-            raise PreviewException(f"Preview over @{self.id}")
-
-        current = driver.current_window_handle
-        current_index = driver.window_handles.index(current)
-
-        driver.execute_script(f"window.open('https://weibo.com/{quote['uid']}/{quote['bid']}#repost', '_blank')")
-        driver.switch_to.window(driver.window_handles[current_index + 1])
+            return False
 
-        try:
-            element_wait = WebDriverWait(driver, 30)
-            execution_wait = WebDriverWait(driver, 15)
-
-            text_textarea_xpath = '//div[@id="composerEle"]/div[2]/div/div[1]/div/textarea'
-            send_button_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/button'
-
-            text_textarea: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, text_textarea_xpath)))
-            send_button: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, send_button_xpath)))
+        self.__navigate(f"https://weibo.com/{quote['uid']}/{quote['bid']}#repost")
 
-            if not options.get("keep_quote", True):
-                tool_div_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div'
+        element_wait = self.__element_wait
+        execution_wait = self.__execution_wait
 
-                # text_textarea.clear()
-                text_textarea.send_keys(Keys.CONTROL, "A")
-                text_textarea.send_keys(Keys.DELETE)
-                execution_wait.until(lambda driver: len(driver.find_elements(By.XPATH, tool_div_xpath)) == 3)
+        text_textarea: WebElement = element_wait.until(EC.presence_of_element_located(self._COMPOSER_TEXT_TEXTAREA))
+        send_button: WebElement = element_wait.until(EC.presence_of_element_located(self._COMPOSER_SEND_BUTTON))
 
-            if options.get("comment", False):
-                comment_checkbox_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div[2]/label/input'
-                comment_span_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div[2]/label/span[1]'
+        if not options.get("keep_quote", True):
+            self.__fill_textarea(text_textarea, "")
+            execution_wait.until(lambda driver: driver.execute_script(_COUNT_XPATH_JS, self._COMPOSER_TOOL_DIV_XPATH) == 3)
 
-                comment_checkbox: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, comment_checkbox_xpath)))
+        if options.get("comment", False):
+            comment_checkbox: WebElement = element_wait.until(EC.presence_of_element_located(self._COMPOSER_CHECKBOX_INPUT))
 
-                # comment_checkbox.click()
-                driver.execute_script("arguments[0].click();", comment_checkbox)
-                execution_wait.until(EC.text_to_be_present_in_element_attribute((By.XPATH, comment_span_xpath), "class", "woo-checkbox-checked"))
+            # comment_checkbox.click()
+            driver.execute_script("arguments[0].click();", comment_checkbox)
+            execution_wait.until(EC.text_to_be_present_in_element_attribute(self._COMPOSER_CHECKBOX_SPAN, "class", "woo-checkbox-checked"))
 
-            text_textarea.send_keys(text)
-            execution_wait.until(EC.element_to_be_clickable((By.XPATH, send_button_xpath)))
+        self.__fill_textarea(text_textarea, text, append = True)
+        execution_wait.until(EC.element_to_be_clickable(send_button))
 
-            repost_a_xpath = '//div[@id="scroller"]/div[1]/div[1]/div/div/div/div/div[2]/div[2]/div[1]/a'
+        repost_a: WebElement | None = repost_a_list[0] if (repost_a_list := driver.find_elements(*self._REPOST_A)) else None
+        repost_a_href: str | None = repost_a.get_attribute("href") if repost_a is not None else None
 
-            repost_a: WebElement | None = repost_a_list[0] if (repost_a_list := driver.find_elements(By.XPATH, repost_a_xpath)) else None
-            repost_a_href: str | None = repost_a.get_attribute("href") if repost_a is not None else None
+        # send_button.click()
+        driver.execute_script("arguments[0].click();", send_button)
+        execution_wait.until(text_to_be_not_equal_to_element_attribute(self._REPOST_A, "href", repost_a_href))
 
-            # send_button.click()
-            driver.execute_script("arguments[0].click();", send_button)
-            execution_wait.until(text_to_be_not_equal_to_element_attribute((By.XPATH, repost_a_xpath), "href", repost_a_href))
-
-        finally:
-            driver.close()
-            driver.switch_to.window(current)
+        return True
 
-    def __send_comment(self, text: str, images: list[str], options: dict[str, Any]) -> None:
+    def __send_comment(self, text: str, images: list[str], options: dict[str, Any]) -> bool:
         quote: dict[str, Any] = options.get("quote", {})
 
-        if not re.search(r"^[0-9]+$", quote["uid"]):
+        if not _RE_DIGITS.fullmatch(quote["uid"]):
             raise ValueError(f"Wrong value of quote.uid @{self.id}; got {repr(quote['uid'])}, expected ^[0-9]+$")
 
-        if not re.search(r"^[A-Za-z0-9]+$", quote["bid"]):
+        if not _RE_ALNUM.fullmatch(quote["bid"]):
             raise ValueError(f"Wrong value of quote.bid @{self.id}; got {repr(quote['bid'])}, expected ^[A-Za-z0-9]+$")
 
         if not text or text.isspace():
@@ -706,51 +1040,49 @@ class Poster:
         preview = self.__preview
 
         if preview:
-            raise PreviewException(f"Preview over @{self.id}")
+            return False
 
-        current = driver.current_window_handle
-        current_index = driver.window_handles.index(current)
+        self.__navigate(f"https://weibo.com/{quote['uid']}/{quote['bid']}#comment")
 
-        driver.execute_script(f"window.open('https://weibo.com/{quote['uid']}/{quote['bid']}#comment', '_blank')")
-        driver.switch_to.window(driver.window_handles[current_index + 1])
+        element_wait = self.__element_wait
+        execution_wait = self.__execution_wait
 
-        try:
-            element_wait = WebDriverWait(driver, 30)
-            execution_wait = WebDriverWait(driver, 15)
+        text_textarea: WebElement = element_wait.until(EC.presence_of_element_located(self._COMPOSER_TEXT_TEXTAREA))
+        send_button: WebElement = element_wait.until(EC.presence_of_element_located(self._COMPOSER_SEND_BUTTON))
 
-            text_textarea_xpath = '//div[@id="composerEle"]/div[2]/div/div[1]/div/textarea'
-            send_button_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/button'
+        self.__fill_textarea(text_textarea, "")
+        execution_wait.until(lambda driver: driver.execute_script(_COUNT_XPATH_JS, self._COMPOSER_TOOL_DIV_XPATH) == 2)
 
-            text_textarea: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, text_textarea_xpath)))
-            send_button: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, send_button_xpath)))
+        if options.get("repost", False):
+            repost_checkbox: WebElement = element_wait.until(EC.presence_of_element_located(self._COMPOSER_CHECKBOX_INPUT))
 
-            tool_div_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div'
+            # repost_checkbox.click()
+            driver.execute_script("arguments[0].click();", repost_checkbox)
+            execution_wait.until(EC.text_to_be_present_in_element_attribute(self._COMPOSER_CHECKBOX_SPAN, "class", "woo-checkbox-checked"))
 
-            # text_textarea.clear()
-            text_textarea.send_keys(Keys.CONTROL, "A")
-            text_textarea.send_keys(Keys.DELETE)
-            execution_wait.until(lambda driver: len(driver.find_elements(By.XPATH, tool_div_xpath)) == 2)
+        self.__fill_textarea(text_textarea, text, append = True)
+        execution_wait.until(EC.element_to_be_clickable(send_button))
 
-            if options.get("repost", False):
-                repost_checkbox_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div[2]/label/input'
-                repost_span_xpath = '//div[@id="composerEle"]/div[2]/div/div[3]/div/div[2]/label/span[1]'
+        # send_button.click()
+        driver.execute_script("arguments[0].click();", send_button)
+        execution_wait.until(EC.element_attribute_to_include(self._COMPOSER_SEND_BUTTON, "disabled"))
 
-                repost_checkbox: WebElement = element_wait.until(EC.presence_of_element_located((By.XPATH, repost_checkbox_xpath)))
+        return True
 
-                # repost_checkbox.click()
-                driver.execute_script("arguments[0].click();", repost_checkbox)
-                execution_wait.until(EC.text_to_be_present_in_element_attribute((By.XPATH, repost_span_xpath), "class", "woo-checkbox-checked"))
+    def __navigate(self, url: str) -> None:
+        driver = self.__driver
 
-            text_textarea.send_keys(text)
-            execution_wait.until(EC.element_to_be_clickable((By.XPATH, send_button_xpath)))
+        (url_base, url_fragment) = urllib.parse.urldefrag(url)
+        reload = bool(url_fragment) and urllib.parse.urldefrag(driver.current_url).url == url_base
 
-            # send_button.click()
-            driver.execute_script("arguments[0].click();", send_button)
-            execution_wait.until(EC.element_attribute_to_include((By.XPATH, send_button_xpath), "disabled"))
+        driver.get(url)
 
-        finally:
-            driver.close()
-            driver.switch_to.window(current)
+        # A fragment-only change does not reload the page.
+        if reload:
+            driver.refresh()
+
+    def __fill_textarea(self, textarea: WebElement, text: str, append: bool = False) -> None:
+        self.__driver.execute_script(_FILL_TEXTAREA_JS, textarea, text, append)
 
     def dispose(self) -> None:
         driver = self.__driver
@@ -763,43 +1095,67 @@ class Poster:
         self.__driver = None
 
 
+def _create_poster(id: str, preview: bool, cookies: CookieProvider) -> Poster:
+    poster = Poster(id)
+
+    try:
+        return poster.with_preview(preview).with_cookies(cookies)
+    except:
+        poster.dispose()
+
+        raise
+
+def _create_posters(cookies: dict[str, CookieProvider], preview: bool) -> dict[str, Poster]:
+    if not cookies:
+        return {}
+
+    with ThreadPoolExecutor(max_workers = min(8, len(cookies))) as executor:
+        futures = {id: executor.submit(_create_poster, id, preview, provider) for id, provider in cookies.items()}
+
+    posters = {id: future.result() for id, future in futures.items() if future.exception() is None}
+
+    if len(posters) < len(futures):
+        for poster in posters.values():
+            poster.dispose()
+
+        raise next(future.exception() for future in futures.values() if future.exception() is not None)
+
+    return posters
+
+
 class User:
     __poster: Poster
-    __scheduler: BaseScheduler
 
-    def __init__(self, poster: Poster, scheduler: BaseScheduler) -> None:
+    def __init__(self, poster: Poster) -> None:
         self.__poster = poster
-        self.__scheduler = scheduler
 
     @property
     def poster(self) -> Poster:
         return self.__poster
 
-    @property
-    def scheduler(self) -> BaseScheduler:
-        return self.__scheduler
-
 
 class Bot:
     __conf: dict[str, Any]
     __preview: bool
     __users: dict[str, User] | None
+    __scheduler: BaseScheduler | None
 
     def __init__(self, conf: dict[str, Any], preview: bool) -> None:
         self.__conf = conf
         self.__preview = preview
         self.__users = None
+        self.__scheduler = None
 
     def init(self) -> None:
 
         @sync
-        def send_post(poster: Poster, kwargs: dict[str, Any]) -> bool:
+        def send_post(poster: Poster, job: _CompiledJob) -> bool:
 
-            def eval_vars(vars: dict[str, Any], envs: dict[str, Any], mods: dict[str, Any]) -> dict[str, Any]:
+            def eval_vars(vars: tuple[tuple[str, CodeType | None, Any], ...], envs: dict[str, Any], mods: dict[str, Any]) -> dict[str, Any]:
                 evaluated_vars: dict[str, Any] = {}
 
-                for var_name, var_expr in vars.items():
-                    evaluated_var = _safe_eval(var_expr, {
+                for var_name, var_code, var_value in vars:
+                    evaluated_var = var_value if var_code is None else _safe_eval_code(var_code, {
                         "envs": envs,
                         "mods": mods,
                         "vars": evaluated_vars
@@ -809,100 +1165,101 @@ class Bot:
 
                 return evaluated_vars
 
-            def execute_commands(commands: dict[str, Any] | None, group: str, kwargs: dict[str, Any] | None, job_id: str) -> None:
-                if not (group_commands := CommandValidator(job_id).validate((commands, group))):
-                    return
-
-                for command in group_commands:
-                    _safe_eval(command, kwargs)
+            def execute_commands(commands: tuple[CodeType, ...], kwargs: dict[str, Any] | None) -> None:
+                for command in commands:
+                    _safe_eval_code(command, kwargs)
 
-            job_id: str = kwargs["id"]
+            job_id: str = job.id
 
-            envs: dict[str, Any] = kwargs["envs"]
-            mods: dict[str, Any] = kwargs["mods"]
-            vars: dict[str, Any] = kwargs["vars"]
+            envs: dict[str, Any] = job.envs
+            mods: dict[str, Any] = job.mods
 
-            select: str | None = kwargs["select"]
-            commands: dict[str, Any] | None = kwargs["commands"]
-            templates: list[dict[str, Any] | str] | None = kwargs["templates"]
+            commands: Mapping[str, tuple[CodeType, ...]] = job.commands
 
             job_kwargs = {
                 "envs": envs,
                 "mods": mods,
-                "vars": eval_vars(vars, envs, mods)
+                "vars": eval_vars(job.vars, envs, mods)
             }
 
             real: bool
 
             try:
-                execute_commands(commands, "pre", job_kwargs, job_id)
+                if "pre" in commands:
+                    execute_commands(commands["pre"], job_kwargs)
 
-                template_conf = TemplateSelector(job_id).select(templates, select)
+                template: _CompiledTemplate = job.selector.select(job.templates, job.select)
+                template_conf = template.conf
 
-                template = TemplateValidator(job_id).validate(template_conf)
-                template_text = template["text"]
-                template_images = template["images"]
-                template_options = template["options"]
+                text = template.text(job_kwargs)
+                images = template.images(job_kwargs)
+                options = template.options(job_kwargs)
 
-                text = _format_fstring(template_text, **job_kwargs)
-                images = [_format_fstring(template_image, **job_kwargs) for template_image in template_images] if isinstance(template_images, list) else [*(evaluated_images if (evaluated_images := _safe_eval(template_images, job_kwargs)) is not None else [])]
-                options = template_options if isinstance(template_options, dict) else { **(evaluated_options if (evaluated_options := _safe_eval(template_options, job_kwargs)) is not None else {}) }
+                if _logger.isEnabledFor(logging.INFO):
+                    _logger.info(_LOG_FORMAT, _format_sender(job_id), _EVENT_PROCESS, _Lazy(_format_process, template_conf, text, images, options))
 
-                _logger.info(
-                    _format_message(
-                        sender = job_id,
-                        event = _EVENT_PROCESS,
-                        message = f'{repr(template_conf)} -> {repr(text if not images and not options else { "text": text, "images": images } if not options else { "text": text, "options": options } if not images else { "text": text, "images": images, "options": options })}'
-                    )
-                )
-
-                try:
-                    poster.send(text = text, images = images, options = options)
-                except PreviewException:
-                    real = False
-                else:
-                    real = True
+                real = poster.send(text = text, images = images, options = options)
 
             except:
-                execute_commands(commands, "fail", job_kwargs, job_id)
+                if "fail" in commands:
+                    execute_commands(commands["fail"], job_kwargs)
 
                 raise
 
             else:
-                execute_commands(commands, "success", job_kwargs, job_id)
+                if "success" in commands:
+                    execute_commands(commands["success"], job_kwargs)
 
             finally:
-                execute_commands(commands, "post", job_kwargs, job_id)
+                if "post" in commands:
+                    execute_commands(commands["post"], job_kwargs)
 
             return real
 
         conf = self.__conf
         preview = self.__preview
         users: dict[str, User] = {}
+        scheduler = BackgroundScheduler(
+            executors = {
+                "default": PoolExecutor(max_workers = 8)
+            },
+            job_defaults = {
+                "coalesce": True,
+                "max_instances": 1,
+                "misfire_grace_time": 30
+            }
+        )
+        user_specs: dict[str, tuple[CookieProvider, list[tuple[str, FullCronTrigger, _CompiledJob]]]] = {}
+        default: dict[str, Any] = conf["default"]
+        default_timezone: str | None = default.get("timezone")
+        default_cookies: dict[str, Any] = default["cookies"]
+        default_envs: dict[str, Any] = default.get("envs", {})
+        default_mods: dict[str, str] = default.get("mods", {})
+        default_vars: dict[str, str] = default.get("vars", {})
+        default_jobs: dict[str, dict[str, Any]] = default.get("jobs", {})
 
         for user_name, user_conf in conf.items():
-            UserNameValidator(user_name).validate(user_name)
+            _validate_user_name(user_name, user_name)
 
-            timezone: str | None = user_conf.get("timezone", conf["default"].get("timezone"))
-            cookies: CookieProvider = CookieParser(user_name).parse(**(CookieValidator(user_name).validate(user_conf.get("cookies", conf["default"]["cookies"]))))
-            envs: dict[str, Any] = copy.deepcopy({
-                **(conf["default"].get("envs", {})),
+            timezone: str | None = user_conf.get("timezone", default_timezone)
+            cookies: CookieProvider = CookieParser(user_name).parse(**(_validate_cookies(user_name, user_conf.get("cookies", default_cookies))))
+            envs: dict[str, Any] = _clone({
+                **default_envs,
                 **(user_conf.get("envs", {}))
             })
-            mods: dict[str, Any] = ModImporter(user_name).import_multi({key: ModValidator(f"{user_name}.{key}").validate(value) for key, value in {
-                **(conf["default"].get("mods", {})),
+            mods: dict[str, Any] = ModImporter(user_name).import_multi({key: _validate_mod(f"{user_name}.{key}", value) for key, value in {
+                **default_mods,
                 **(user_conf.get("mods", {}))
             }.items()}, lambda mods: { "envs": envs, "mods": mods })
-            vars: dict[str, Any] = copy.deepcopy({
-                **(conf["default"].get("vars", {})),
+            vars: dict[str, str] = {
+                **default_vars,
                 **(user_conf.get("vars", {}))
-            })
-            jobs: dict[str, dict[str, Any]] = user_conf.get("jobs", conf["default"].get("jobs", {}))
-            poster = Poster(user_name).with_preview(preview).with_cookies(cookies)
-            scheduler = BackgroundScheduler()
+            }
+            jobs: dict[str, dict[str, Any]] = user_conf.get("jobs", default_jobs)
+            user_jobs: list[tuple[str, FullCronTrigger, _CompiledJob]] = []
 
             for job_name, job_conf in jobs.items():
-                JobNameValidator(user_name).validate(job_name)
+                _validate_job_name(user_name, job_name)
 
                 job_id = f"{user_name}.{job_name}"
 
@@ -912,114 +1269,54 @@ class Bot:
                 job_commands: dict[str, Any] | None = job_conf.get("commands")
                 job_templates: list[dict[str, Any] | str] | None = job_conf.get("templates")
 
-                scheduler.add_job(send_post, FullCronTrigger.from_cron(job_cron, timezone, job_jitter), kwargs = {
-                    "kwargs": {
-                        "id": job_id,
+                job = JobCompiler(job_id).compile(envs, mods, vars, job_select, job_commands, job_templates)
 
-                        "envs": envs,
-                        "mods": mods,
-                        "vars": vars,
-
-                        "select": job_select,
-                        "commands": job_commands,
-                        "templates": job_templates,
-                    },
-
-                    "poster": poster
-                }, id = job_id)
-
-            scheduler.add_listener(
-                lambda event: (_logger.info(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_EXECUTION,
-                        message = "Success!" if event.retval else "Preview over!"
-                    )
-                ), _logger.info(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_NOTIFICATION,
-                        message = f"The next job is scheduled for '{scheduler.get_job(event.job_id).next_run_time:%Y-%m-%d %H:%M:%S}'"
-                    )
-                )),
-                events.EVENT_JOB_EXECUTED
-            )
-            scheduler.add_listener(
-                lambda event: (_logger.warning(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_EXECUTION,
-                        message = f"The job scheduled for '{event.scheduled_run_time:%Y-%m-%d %H:%M:%S}' has missed!"
-                    )
-                ), _logger.info(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_NOTIFICATION,
-                        message = f"The next job is scheduled for '{scheduler.get_job(event.job_id).next_run_time:%Y-%m-%d %H:%M:%S}'"
-                    )
-                )),
-                events.EVENT_JOB_MISSED
-            )
-            scheduler.add_listener(
-                lambda event: (_logger.warning(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_EXECUTION,
-                        message = f"The job scheduled for {[f'{scheduled_run_time:%Y-%m-%d %H:%M:%S}' for scheduled_run_time in event.scheduled_run_times]} has skipped!"
-                    )
-                ), _logger.info(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_NOTIFICATION,
-                        message = f"The next job is scheduled for '{scheduler.get_job(event.job_id).next_run_time:%Y-%m-%d %H:%M:%S}'"
-                    )
-                )),
-                events.EVENT_JOB_MAX_INSTANCES
-            )
-            scheduler.add_listener(
-                lambda event: (_logger.error(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_EXECUTION,
-                        message = f"Oops, an error occurred! -> {repr(event.exception)}"
-                    )
-                ), _logger.info(
-                    _format_message(
-                        sender = event.job_id,
-                        event = _EVENT_NOTIFICATION,
-                        message = f"The next job is scheduled for '{scheduler.get_job(event.job_id).next_run_time:%Y-%m-%d %H:%M:%S}'"
-                    )
-                )),
-                events.EVENT_JOB_ERROR
-            )
+                user_jobs.append((job_id, _build_cron_trigger(job_cron, timezone, job_jitter), job))
 
-            users[user_name] = User(poster, scheduler)
+            user_specs[user_name] = (cookies, user_jobs)
 
-        for user in users.values():
-            user.scheduler.start(paused = True)
+        posters = _create_posters({user_name: cookies for user_name, (cookies, _) in user_specs.items()}, preview)
+
+        for user_name, (_, user_jobs) in user_specs.items():
+            poster = posters[user_name]
+
+            for job_id, trigger, job in user_jobs:
+                scheduler.add_job(send_post, trigger, args = (poster, job), id = job_id)
+
+            users[user_name] = User(poster)
+
+        scheduler.add_listener(functools.partial(_on_job_event, scheduler), _JOB_EVENT_MASK)
 
         self.__users = users
+        self.__scheduler = scheduler
 
     def start(self) -> None:
-        users = self.__users
+        scheduler = self.__scheduler
 
-        for user in users.values():
-            user.scheduler.resume()
+        if scheduler.state == STATE_STOPPED:
+            scheduler.start()
+        else:
+            scheduler.resume()
 
     def stop(self) -> None:
-        users = self.__users
+        scheduler = self.__scheduler
 
-        for user in users.values():
-            user.scheduler.pause()
+        if scheduler.state != STATE_STOPPED:
+            scheduler.pause()
 
     def uninit(self) -> None:
         users = self.__users
 
+        scheduler = self.__scheduler
+
+        if scheduler.state != STATE_STOPPED:
+            scheduler.shutdown(wait = False)
+
         for user in users.values():
-            user.scheduler.shutdown(wait = False)
             user.poster.dispose()
 
         self.__users = None
+        self.__scheduler = None
 
 
 if __name__ == '__main__':
@@ -1068,135 +1365,50 @@ if __name__ == '__main__':
         }
     })
 
-    sys.excepthook = lambda type, value, traceback: _logger.error(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = f"Oops, an error occurred! -> {repr(value)}",
-            root = True
-        )
-    )
-
-    _logger.info(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Welcome!",
-            root = True
-        )
-    )
+    sys.excepthook = lambda type, value, traceback: _logger.error(_SYSTEM_FORMAT, _Lazy(lambda: f"Oops, an error occurred! -> {repr(value)}"))
+
+    _logger.info(_SYSTEM_FORMAT, "Welcome!")
 
     conf: dict[str, Any]
     preview: bool
 
-    with open(args.configuration, "rb") as f:
-        conf = tomllib.load(f)
+    conf = _load_conf(args.configuration)
 
     preview = args.preview or not args.real
 
-    _logger.info(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = f"Preview {'On' if preview else 'Off'}!",
-            root = True
-        )
-    )
+    _logger.info(_SYSTEM_FORMAT, f"Preview {'On' if preview else 'Off'}!")
 
     bot = Bot(conf, preview)
 
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Init...",
-            root = True
-        )
-    )
+    _logger.debug(_SYSTEM_FORMAT, "Init...")
 
     bot.init()
 
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Init OK!",
-            root = True
-        )
-    )
-
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Start...",
-            root = True
-        )
-    )
+    _logger.debug(_SYSTEM_FORMAT, "Init OK!")
+
+    _logger.debug(_SYSTEM_FORMAT, "Start...")
 
     bot.start()
 
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Start OK!",
-            root = True
-        )
-    )
+    _logger.debug(_SYSTEM_FORMAT, "Start OK!")
 
     event = Event()
 
-    signal.signal(signal.SIGTERM, (lambda signum, frame: event.set()))
-    signal.signal(signal.SIGINT, (lambda signum, frame: signal.raise_signal(signal.SIGTERM)))
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, (lambda signum, frame: event.set()))
 
     event.wait()
 
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Stop...",
-            root = True
-        )
-    )
+    _logger.debug(_SYSTEM_FORMAT, "Stop...")
 
     bot.stop()
     
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Stop OK!",
-            root = True
-        )
-    )
-
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Uninit...",
-            root = True
-        )
-    )
+    _logger.debug(_SYSTEM_FORMAT, "Stop OK!")
+
+    _logger.debug(_SYSTEM_FORMAT, "Uninit...")
 
     bot.uninit()
     
-    _logger.debug(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Uninit OK!",
-            root = True
-        )
-    )
-
-    _logger.info(
-        _format_message(
-            sender = _SYSTEM,
-            event = _EVENT_EXECUTION,
-            message = "Bye!",
-            root = True
-        )
-    )
+    _logger.debug(_SYSTEM_FORMAT, "Uninit OK!")
+
+    _logger.info(_SYSTEM_FORMAT, "Bye!")